@@ -18,17 +18,159 @@ Usage:
 
 from extras.scripts import Script, ObjectVar, ChoiceVar, BooleanVar, StringVar
 from tenancy.models import Contact, ContactGroup
-from django.http import HttpResponse
 from django.utils.text import slugify
 from django.core.exceptions import ValidationError
+from django.db.models import Q
+import functools
+import io
+import itertools
+import os
 import re
+import requests
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+from collections import defaultdict
 
 # Set up logging for debugging
 logger = logging.getLogger(__name__)
 
+# Number of contacts fetched from the database per round-trip while streaming
+CONTACT_CHUNK_SIZE = 2000
+
+# Number of validated contacts formatted and written together as one block
+FORMAT_CHUNK_SIZE = 5000
+
+# Page size requested from the REST API by ContactVCFExportAPI
+API_PAGE_SIZE = 1000
+
+# slugify() normalizes Unicode and runs regexes; group names repeat across runs
+_safe_slug = functools.lru_cache(maxsize=256)(slugify)
+
+# Precompiled patterns used by the per-contact cleaning helpers
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PHONE_STRIP_RE = re.compile(r'[^\d+]')
+_DIGIT_RE = re.compile(r'[^\d]')
+_NAME_RE = re.compile(r'[^\w\s\-\.]')
+
+# Translation table for characters that must be escaped in vCard text values
+_VCF_ESCAPE = str.maketrans({
+    '\\': '\\\\',
+    ',': '\\,',
+    ';': '\\;',
+    '\n': '\\n',
+    '\r': '',
+})
+
+# vCard layout shared by every version. Optional properties are substituted as
+# whole CRLF-terminated lines (or empty strings), and a blank line separates cards.
+_VCARD_TEMPLATE = (
+    "BEGIN:VCARD\r\n"
+    "VERSION:{version}\r\n"
+    "FN:{name}\r\n"
+    "N:{n_last};{n_first};;;\r\n"
+    "{email}{phone}{title}{address}{note}"
+    "UID:{uid}\r\n"
+    "REV:{rev}\r\n"
+    "END:VCARD\r\n"
+    "\r\n"
+)
+
+# EMAIL and TEL property names (with type parameters) for each vCard version
+_VCARD_PROPERTIES = {
+    '3.0': ('EMAIL;TYPE=INTERNET', 'TEL;TYPE=VOICE'),
+    '4.0': ('EMAIL', 'TEL'),
+}
+
+
+def _escape_vcf_text(value):
+    """
+    Escape a vCard text value (RFC 6350 section 3.4).
+    
+    Most values contain nothing to escape, so they are checked first and
+    returned untouched; the rest go through a single str.translate() pass.
+    """
+    if value and any(c in value for c in '\\,;\n\r'):
+        return value.translate(_VCF_ESCAPE)
+    return value
+
+
+def _uuid4_stream(batch_size=CONTACT_CHUNK_SIZE):
+    """
+    Yield random (version 4) UUIDs, reading the random bytes in batches.
+    
+    Equivalent to calling uuid.uuid4() repeatedly, but with one os.urandom()
+    call per batch instead of one per UUID.
+    """
+    while True:
+        pool = os.urandom(16 * batch_size)
+        for offset in range(0, len(pool), 16):
+            # version=4 sets the version and variant bits just like uuid4() does
+            yield uuid.UUID(bytes=pool[offset:offset + 16], version=4)
+
+
+def _chunked(iterable, size):
+    """Yield lists of up to 'size' items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _format_chunk(contacts, vcf_version, rev):
+    """
+    Render a list of validated contacts as UTF-8 encoded vCards.
+    
+    This is the hot loop of the export, so globals and bound methods are
+    looked up once per chunk, not per contact.
+    """
+    # Version-specific choices are made once, not once per contact
+    email_property, phone_property = _VCARD_PROPERTIES[vcf_version]
+    uids = _uuid4_stream(len(contacts))
+    escape = _escape_vcf_text
+    render = _VCARD_TEMPLATE.format_map
+    buf = bytearray()
+    
+    for contact in contacts:
+        email = contact['email']
+        phone = contact['phone']
+        title = contact['title']
+        address = contact['address']
+        comments = contact['comments']
+        groups = contact['groups']
+        
+        # Add notes/comments and group membership information
+        if comments and groups:
+            note = f"Comments: {comments} | Groups: {', '.join(groups)}"
+        elif comments:
+            note = f"Comments: {comments}"
+        elif groups:
+            note = f"Groups: {', '.join(groups)}"
+        else:
+            note = ""
+        
+        # Optional properties render as a complete line or an empty string
+        fields = {
+            'version': vcf_version,
+            'name': escape(contact['name']),
+            'n_last': escape(contact['n_last']),
+            'n_first': escape(contact['n_first']),
+            'email': f"{email_property}:{email}\r\n" if email else "",
+            'phone': f"{phone_property}:{phone}\r\n" if phone else "",
+            'title': f"TITLE:{escape(title)}\r\n" if title else "",
+            'address': f"ADR:;;{escape(address)};;;;\r\n" if address else "",
+            'note': f"NOTE:{escape(note)}\r\n" if note else "",
+            'uid': next(uids),
+            'rev': rev,
+        }
+        
+        buf += render(fields).encode('utf-8')
+    
+    return bytes(buf)
+
+
 class ContactToVCFExport(Script):
     """
     Export contacts from a NetBox ContactGroup to VCF format.
@@ -93,124 +235,156 @@ class ContactToVCFExport(Script):
         self.log_info(f"VCF Version: {vcf_version}")
         
         # Step 2: Gather all contacts from the selected group
+        # Contacts are streamed from the database, so peek at the first one to
+        # find out whether there is anything to export at all
         try:
             contacts = self._gather_contacts(contact_group, include_subgroups)
-            self.log_info(f"Found {len(contacts)} contacts to export")
+            first_contact = next(contacts, None)
             
-            if not contacts:
+            if first_contact is None:
                 self.log_warning("No contacts found in the selected group")
                 return "No contacts found to export"
+            
+            contacts = itertools.chain([first_contact], contacts)
                 
         except Exception as e:
             self.log_failure(f"Error gathering contacts: {str(e)}")
             return f"Error gathering contacts: {str(e)}"
         
-        # Step 3: Validate and clean contact data
-        try:
-            validated_contacts = self._validate_contacts(contacts)
-            self.log_info(f"Validated {len(validated_contacts)} contacts")
-            
-        except Exception as e:
-            self.log_failure(f"Error validating contacts: {str(e)}")
-            return f"Error validating contacts: {str(e)}"
-        
-        # Step 4: Generate VCF content
-        try:
-            vcf_content = self._generate_vcf_content(validated_contacts, vcf_version)
-            self.log_success("VCF content generated successfully")
-            
-        except Exception as e:
-            self.log_failure(f"Error generating VCF content: {str(e)}")
-            return f"Error generating VCF content: {str(e)}"
+        # Step 3 & 4: Validate contacts and generate VCF content
+        # Both steps are generators - no work happens until the file is written,
+        # so only one database chunk of contacts is held in memory at a time
+        validated_contacts = self._validate_contacts(contacts)
+        vcf_content = self._generate_vcf_content(validated_contacts, vcf_version)
         
         # Step 5: Create and save the file
         try:
             filename = self._generate_filename(filename_prefix, contact_group.name)
-            self._save_vcf_file(vcf_content, filename)
+            exported_count = self._save_vcf_file(vcf_content, filename)
             
             self.log_success(f"VCF file '{filename}' created successfully")
-            return f"Successfully exported {len(validated_contacts)} contacts to {filename}"
+            return f"Successfully exported {exported_count} contacts to {filename}"
             
         except Exception as e:
-            self.log_failure(f"Error saving VCF file: {str(e)}")
-            return f"Error saving VCF file: {str(e)}"
+            self.log_failure(f"Error exporting contacts: {str(e)}")
+            return f"Error exporting contacts: {str(e)}"
 
     def _gather_contacts(self, contact_group, include_subgroups):
         """
         Gather all contacts from the specified group.
         
-        This method handles the recursive nature of contact groups and the many-to-many
+        Contacts are yielded one at a time as plain dictionaries from a
+        server-side iterator rather than returned as a list of model instances,
+        keeping memory flat and skipping model construction for large groups.
+        Each dictionary carries a 'groups' list with the contact's group names.
+        
+        This method handles the nested nature of contact groups and the many-to-many
         relationship between contacts and groups. A contact can belong to multiple groups,
         so we use the 'groups' field (plural) to find contacts.
         """
-        contacts = []
-        
-        # Get direct contacts from this group using the many-to-many relationship
-        # We use 'groups' (plural) because contacts can belong to multiple groups
-        direct_contacts = Contact.objects.filter(groups=contact_group)
-        contacts.extend(direct_contacts)
-        
-        self.log_info(f"Found {len(direct_contacts)} direct contacts in '{contact_group.name}'")
+        group_ids = [contact_group.pk]
         
-        # If requested, recursively get contacts from subgroups
+        # ContactGroup is an MPTT tree, so the whole subtree is resolved in one query
+        # instead of one ContactGroup lookup per level
         if include_subgroups:
-            subgroups = ContactGroup.objects.filter(parent=contact_group)
+            subgroup_ids = list(contact_group.get_descendants().values_list('pk', flat=True))
+            group_ids.extend(subgroup_ids)
+            self.log_info(f"Including {len(subgroup_ids)} subgroups of '{contact_group.name}'")
+        
+        # One query for every contact in the subtree. We use 'groups' (plural) because
+        # contacts can belong to multiple groups, and distinct() drops the duplicates
+        # that produces in the database rather than in Python.
+        # Contacts that can never produce a vCard (no name, or neither an email
+        # nor a phone) are excluded here instead of being fetched and skipped.
+        # values() limits the SELECT to the columns the vCard actually uses and
+        # returns dictionaries instead of full Contact instances. The explicit
+        # ordering keeps the export sorted and stable, and only uses selected
+        # columns so DISTINCT stays on the rows we actually fetch.
+        contacts = Contact.objects.filter(
+            groups__in=group_ids
+        ).exclude(
+            name=''
+        ).filter(
+            Q(email__gt='') | Q(phone__gt='')
+        ).values(
+            'id', 'name', 'email', 'phone', 'title', 'address', 'comments'
+        ).order_by('name', 'id').distinct()
+        contact_rows = contacts.iterator(chunk_size=CONTACT_CHUNK_SIZE)
+        
+        # Group names are attached one chunk at a time, with a single query per
+        # chunk over the 'groups' relation instead of one per contact.
+        # Names are ordered like ContactGroup's default ordering so the NOTE
+        # text is stable between exports.
+        for chunk in _chunked(contact_rows, CONTACT_CHUNK_SIZE):
+            group_map = defaultdict(list)
+            memberships = Contact.objects.filter(
+                pk__in=[row['id'] for row in chunk]
+            ).order_by(
+                'pk', 'groups__name'
+            ).values_list('pk', 'groups__name')
+            for contact_id, group_name in memberships:
+                if group_name is not None:
+                    group_map[contact_id].append(group_name)
             
-            for subgroup in subgroups:
-                self.log_info(f"Processing subgroup: {subgroup.name}")
-                subgroup_contacts = self._gather_contacts(subgroup, include_subgroups)
-                contacts.extend(subgroup_contacts)
-        
-        # Remove duplicates (in case a contact appears in multiple groups)
-        # This is especially important with many-to-many relationships
-        unique_contacts = list(set(contacts))
-        
-        if len(contacts) != len(unique_contacts):
-            self.log_info(f"Removed {len(contacts) - len(unique_contacts)} duplicate contacts")
-        
-        return unique_contacts
+            for row in chunk:
+                row['groups'] = group_map[row['id']]
+                yield row
 
     def _validate_contacts(self, contacts):
         """
         Validate and clean contact data before VCF generation.
         
         This step is crucial because NetBox allows flexible data entry,
-        but VCF format has specific requirements.
+        but VCF format has specific requirements. Cleaned contacts are
+        yielded as they are validated.
+        
+        Skipped contacts are counted and reported in a single summary once
+        all contacts have been processed, since every script log entry is
+        stored in the database.
         """
-        validated_contacts = []
+        skipped_no_name = 0
+        skipped_no_contact = 0
         
         for contact in contacts:
-            try:
-                # Create a cleaned contact dictionary
-                cleaned_contact = {
-                    'id': contact.id,
-                    'name': self._clean_name(contact.name),
-                    'email': self._clean_email(contact.email),
-                    'phone': self._clean_phone(contact.phone),
-                    'title': getattr(contact, 'title', ''),
-                    'address': getattr(contact, 'address', ''),
-                    'comments': getattr(contact, 'comments', ''),
-                    'groups': [group.name for group in contact.groups.all()],  # Get all group names
-                    'original_contact': contact  # Keep reference for debugging
-                }
-                
-                # Validate that we have at least a name
-                if not cleaned_contact['name']:
-                    self.log_warning(f"Skipping contact with ID {contact.id}: No name provided")
-                    continue
-                
-                # Validate that we have at least one contact method
-                if not cleaned_contact['email'] and not cleaned_contact['phone']:
-                    self.log_warning(f"Skipping contact '{cleaned_contact['name']}': No email or phone provided")
-                    continue
-                
-                validated_contacts.append(cleaned_contact)
-                
-            except Exception as e:
-                self.log_warning(f"Error processing contact ID {contact.id}: {str(e)}")
+            # Create a cleaned contact dictionary
+            cleaned_contact = {
+                'id': contact['id'],
+                'name': self._clean_name(contact['name']),
+                'email': self._clean_email(contact['email']),
+                'phone': self._clean_phone(contact['phone']),
+                'title': contact['title'] or '',
+                'address': contact['address'] or '',
+                'comments': contact['comments'] or '',
+                'groups': contact['groups'],  # Group names attached by _gather_contacts
+            }
+            
+            # Blank names and contacts without an email or phone are already
+            # filtered out in _gather_contacts; these checks only catch values
+            # that cleaning rejected (e.g. a malformed email address)
+            if not cleaned_contact['name']:
+                skipped_no_name += 1
+                continue
+            
+            if not cleaned_contact['email'] and not cleaned_contact['phone']:
+                skipped_no_contact += 1
                 continue
+            
+            # Split the structured name once here rather than at VCF generation
+            name_parts = cleaned_contact['name'].split()
+            if len(name_parts) >= 2:
+                cleaned_contact['n_last'] = name_parts[-1]
+                cleaned_contact['n_first'] = " ".join(name_parts[:-1])
+            else:
+                cleaned_contact['n_last'] = cleaned_contact['name']
+                cleaned_contact['n_first'] = ""
+            
+            yield cleaned_contact
         
-        return validated_contacts
+        if skipped_no_name or skipped_no_contact:
+            self.log_warning(
+                f"Skipped {skipped_no_name} contacts with no usable name, "
+                f"{skipped_no_contact} with no valid email or phone"
+            )
 
     def _clean_name(self, name):
         """Clean and validate contact name."""
@@ -218,7 +392,7 @@ class ContactToVCFExport(Script):
             return ""
         
         # Remove any characters that might cause issues in VCF
-        cleaned = re.sub(r'[^\w\s\-\.]', '', str(name).strip())
+        cleaned = _NAME_RE.sub('', str(name).strip())
         return cleaned[:100]  # Limit length to prevent issues
 
     def _clean_email(self, email):
@@ -227,10 +401,9 @@ class ContactToVCFExport(Script):
             return ""
         
         # Basic email validation regex
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         email = str(email).strip().lower()
         
-        if re.match(email_pattern, email):
+        if _EMAIL_RE.match(email):
             return email
         else:
             return ""  # Invalid email, return empty string
@@ -241,10 +414,10 @@ class ContactToVCFExport(Script):
             return ""
         
         # Remove all non-numeric characters except +
-        cleaned = re.sub(r'[^\d+]', '', str(phone))
+        cleaned = _PHONE_STRIP_RE.sub('', str(phone))
         
         # Basic phone number validation (at least 7 digits)
-        if len(re.sub(r'[^\d]', '', cleaned)) >= 7:
+        if len(_DIGIT_RE.sub('', cleaned)) >= 7:
             return cleaned
         else:
             return ""  # Invalid phone, return empty string
@@ -255,84 +428,26 @@ class ContactToVCFExport(Script):
         
         This method creates proper vCard format based on the selected version.
         VCF format is quite specific about line endings and structure.
+        Contacts are formatted in chunks of FORMAT_CHUNK_SIZE, in the original
+        order. Each chunk is yielded as a (contact count, block) pair, where
+        the block holds the chunk's vCards as UTF-8 encoded bytes.
         """
-        vcf_lines = []
-        
-        for contact in contacts:
-            # Start vCard
-            vcf_lines.append("BEGIN:VCARD")
-            vcf_lines.append(f"VERSION:{vcf_version}")
-            
-            # Add name (required field)
-            # FN = Formatted Name, N = Structured Name
-            vcf_lines.append(f"FN:{contact['name']}")
-            
-            # For structured name, we'll try to split first/last name
-            name_parts = contact['name'].split()
-            if len(name_parts) >= 2:
-                last_name = name_parts[-1]
-                first_name = " ".join(name_parts[:-1])
-                vcf_lines.append(f"N:{last_name};{first_name};;;")
-            else:
-                vcf_lines.append(f"N:{contact['name']};;;;")
-            
-            # Add email if available
-            if contact['email']:
-                if vcf_version == '4.0':
-                    vcf_lines.append(f"EMAIL:{contact['email']}")
-                else:
-                    vcf_lines.append(f"EMAIL;TYPE=INTERNET:{contact['email']}")
-            
-            # Add phone if available
-            if contact['phone']:
-                if vcf_version == '4.0':
-                    vcf_lines.append(f"TEL:{contact['phone']}")
-                else:
-                    vcf_lines.append(f"TEL;TYPE=VOICE:{contact['phone']}")
-            
-            # Add title if available
-            if contact['title']:
-                vcf_lines.append(f"TITLE:{contact['title']}")
-            
-            # Add address if available
-            if contact['address']:
-                vcf_lines.append(f"ADR:;;{contact['address']};;;;")
-            
-            # Add notes/comments if available
-            notes = []
-            if contact['comments']:
-                notes.append(f"Comments: {contact['comments']}")
-            
-            # Add group membership information
-            if contact['groups']:
-                group_list = ", ".join(contact['groups'])
-                notes.append(f"Groups: {group_list}")
-            
-            if notes:
-                note_text = " | ".join(notes)
-                vcf_lines.append(f"NOTE:{note_text}")
-            
-            # Add unique ID
-            vcf_lines.append(f"UID:{uuid.uuid4()}")
-            
-            # Add revision timestamp
-            timestamp = datetime.now().strftime("%Y%m%dT%H%M%SZ")
-            vcf_lines.append(f"REV:{timestamp}")
-            
-            # End vCard
-            vcf_lines.append("END:VCARD")
-            vcf_lines.append("")  # Empty line between contacts
-        
-        # Join all lines with proper line endings
-        return "\r\n".join(vcf_lines)
+        # Every card in one export shares the same revision timestamp (UTC, as the Z says)
+        rev = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        
+        # Formatting stays in this process. Worker processes would have to be
+        # forked from the NetBox worker while a server-side cursor is open on the
+        # inherited database connection, and forking a threaded process is unsafe.
+        for chunk in _chunked(contacts, FORMAT_CHUNK_SIZE):
+            yield len(chunk), _format_chunk(chunk, vcf_version, rev)
 
     def _generate_filename(self, prefix, group_name):
         """Generate a safe filename for the VCF file."""
         # Clean the group name for use in filename
-        safe_group_name = slugify(group_name)
+        safe_group_name = _safe_slug(group_name)
         
-        # Create timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Create timestamp (UTC, matching the REV values inside the file)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         
         # Combine into filename
         filename = f"{prefix}_{safe_group_name}_{timestamp}.vcf"
@@ -343,10 +458,13 @@ class ContactToVCFExport(Script):
         """
         Save VCF content to a file.
         
+        The content is an iterable of (contact count, encoded block) pairs
+        from _generate_vcf_content, written out as it is consumed. Returns
+        the number of contacts written.
+        
         In NetBox, custom scripts can write to the media directory,
         which is typically accessible via the web interface.
         """
-        import os
         from django.conf import settings
         
         # Define the output directory
@@ -358,9 +476,24 @@ class ContactToVCFExport(Script):
         # Full file path
         file_path = os.path.join(output_dir, filename)
         
-        # Write the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write the file, one vCard at a time through a 1 MiB binary buffer.
+        # The blocks are already bytes, so no text layer or encoder is needed.
+        # Content is streamed, so an error can happen partway through; write to
+        # a temporary name and only move it into place once it is complete, so
+        # a truncated export is never published.
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        exported_count = 0
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            with io.BufferedWriter(io.FileIO(fd, 'wb'), buffer_size=1 << 20) as f:
+                for contact_count, block in content:
+                    f.write(block)
+                    exported_count += contact_count
+            os.replace(temp_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
         
         # Log the file location
         self.log_info(f"VCF file saved to: {file_path}")
@@ -369,6 +502,8 @@ class ContactToVCFExport(Script):
         # The media URL will be something like: /media/vcf_exports/filename.vcf
         media_url = f"{settings.MEDIA_URL}vcf_exports/{filename}"
         self.log_info(f"File accessible at: {media_url}")
+        
+        return exported_count
 
 
 # Additional utility script for direct API usage
@@ -394,16 +529,37 @@ class ContactVCFExportAPI:
             'Authorization': f'Token {api_token}',
             'Content-Type': 'application/json'
         }
+        
+        # One session for every request so the TCP/TLS connection is kept alive
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+    
+    def _get_all(self, url, params=None):
+        """
+        Retrieve every result from a paginated list endpoint.
+        
+        Follows the 'next' links NetBox returns until all pages are read.
+        """
+        params = {'limit': API_PAGE_SIZE, **(params or {})}
+        results = []
+        
+        while url:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            
+            data = response.json()
+            results.extend(data['results'])
+            
+            # The 'next' URL already carries the query string
+            url = data.get('next')
+            params = None
+        
+        return results
     
     def get_contact_groups(self):
         """Retrieve all contact groups."""
-        import requests
-        
         url = f"{self.netbox_url}/api/tenancy/contact-groups/"
-        response = requests.get(url, headers=self.headers)
-        response.raise_for_status()
-        
-        return response.json()['results']
+        return self._get_all(url)
     
     def get_contacts_by_group(self, group_id):
         """
@@ -412,15 +568,10 @@ class ContactVCFExportAPI:
         Note: This uses the 'groups' field (plural) because contacts can belong
         to multiple groups simultaneously in NetBox's many-to-many relationship model.
         """
-        import requests
-        
         url = f"{self.netbox_url}/api/tenancy/contacts/"
         params = {'groups': group_id}  # Changed from 'group_id' to 'groups'
         
-        response = requests.get(url, headers=self.headers, params=params)
-        response.raise_for_status()
-        
-        return response.json()['results']
+        return self._get_all(url, params)
     
     def export_group_to_vcf(self, group_id, filename=None):
         """Export a contact group to VCF format."""
@@ -432,33 +583,41 @@ class ContactVCFExportAPI:
         # Generate VCF content (simplified version)
         vcf_content = self._generate_simple_vcf(contacts)
         
+        # newline='' keeps the CRLF line endings as they are; the text layer
+        # encodes through its buffer, so no second full-size copy is made
         if filename:
-            with open(filename, 'w', encoding='utf-8') as f:
+            with open(filename, 'w', encoding='utf-8', newline='') as f:
                 f.write(vcf_content)
         
         return vcf_content
     
     def _generate_simple_vcf(self, contacts):
-        """Generate simple VCF content from API contact data."""
-        vcf_lines = []
+        """
+        Generate simple VCF content from API contact data.
+        
+        Each vCard is built as one string, rather than a list of per-line
+        strings joined at the end.
+        """
+        cards = []
         
         for contact in contacts:
-            vcf_lines.append("BEGIN:VCARD")
-            vcf_lines.append("VERSION:3.0")
-            vcf_lines.append(f"FN:{contact['name']}")
-            vcf_lines.append(f"N:{contact['name']};;;;")
+            card = (
+                "BEGIN:VCARD\r\n"
+                "VERSION:3.0\r\n"
+                f"FN:{contact['name']}\r\n"
+                f"N:{contact['name']};;;;\r\n"
+            )
             
             if contact.get('email'):
-                vcf_lines.append(f"EMAIL;TYPE=INTERNET:{contact['email']}")
+                card += f"EMAIL;TYPE=INTERNET:{contact['email']}\r\n"
             
             if contact.get('phone'):
-                vcf_lines.append(f"TEL;TYPE=VOICE:{contact['phone']}")
+                card += f"TEL;TYPE=VOICE:{contact['phone']}\r\n"
             
-            vcf_lines.append(f"UID:{uuid.uuid4()}")
-            vcf_lines.append("END:VCARD")
-            vcf_lines.append("")
+            card += f"UID:{uuid.uuid4()}\r\nEND:VCARD\r\n\r\n"
+            cards.append(card)
         
-        return "\r\n".join(vcf_lines)
+        return "".join(cards)
 
 
 # Example usage and testing